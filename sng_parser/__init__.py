@@ -11,6 +11,10 @@
 
 from .parser import *
 from .utils import *
+from .export import *
+from .alignment import *
+from .pool import *
+from .scheduler import *
 
 __version__ = (0, 1, 0)
 __author__ = 'Jiayuan Mao'
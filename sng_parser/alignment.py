@@ -0,0 +1,100 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File   : alignment.py
+# Author : Jiayuan Mao
+# Email  : maojiayuan@gmail.com
+# Date   : 10/19/2026
+#
+# This file is part of SceneGraphParser.
+# Distributed under terms of the MIT license.
+# https://github.com/vacancy/SceneGraphParser
+
+from array import array
+
+__all__ = ['TokenAlignment']
+
+
+class TokenAlignment(object):
+    """
+    A compact record aligning a scene graph back to the tokens of the input sentence.
+
+    Different from the backend document (e.g., a spaCy `Doc`), the record holds no reference
+    to the backend: all per-token fields are stored as `array.array`, and the tag and
+    dependency labels as small per-sentence tables. Thus, it is cheap to keep and to pickle.
+
+    Attributes:
+        starts, ends (array): the character offsets of each token in the sentence.
+        pos, deps (array): the ids of the POS tag and the dependency label of each token,
+            indexing into `pos_labels` and `dep_labels`.
+        heads (array): the index of the syntactic head of each token (the root points to itself).
+        entity_tokens (array): the index of the head token of each entity.
+        relation_tokens (array): the index of the relation token of each relation (for multi-word
+            relations such as "next to", the last word, which governs the object).
+        subject_tokens, object_tokens (array): the index of the subject and object head tokens of each relation.
+    """
+
+    __slots__ = [
+        'starts', 'ends', 'pos', 'pos_labels', 'deps', 'dep_labels', 'heads',
+        'entity_tokens', 'relation_tokens', 'subject_tokens', 'object_tokens'
+    ]
+
+    def __init__(self, starts, ends, pos, pos_labels, deps, dep_labels, heads, entity_tokens, relation_tokens, subject_tokens, object_tokens):
+        self.starts = starts
+        self.ends = ends
+        self.pos = pos
+        self.pos_labels = pos_labels
+        self.deps = deps
+        self.dep_labels = dep_labels
+        self.heads = heads
+        self.entity_tokens = entity_tokens
+        self.relation_tokens = relation_tokens
+        self.subject_tokens = subject_tokens
+        self.object_tokens = object_tokens
+
+    @classmethod
+    def from_tokens(cls, tokens, entity_tokens, relation_tokens, subject_tokens, object_tokens):
+        """
+        Build the record from a sequence of (start, end, pos, dep, head) tuples.
+        """
+        pos_table, dep_table = dict(), dict()
+        starts, ends, pos, deps, heads = array('I'), array('I'), array('B'), array('B'), array('i')
+        for start, end, p, d, h in tokens:
+            starts.append(start)
+            ends.append(end)
+            pos.append(pos_table.setdefault(p, len(pos_table)))
+            deps.append(dep_table.setdefault(d, len(dep_table)))
+            heads.append(h)
+
+        return cls(
+            starts, ends,
+            pos, tuple(pos_table), deps, tuple(dep_table), heads,
+            array('i', entity_tokens), array('i', relation_tokens),
+            array('i', subject_tokens), array('i', object_tokens)
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def char_span(self, i):
+        """
+        Get the (start, end) character offsets of the i-th token.
+        """
+        return self.starts[i], self.ends[i]
+
+    def pos_(self, i):
+        return self.pos_labels[self.pos[i]]
+
+    def dep_(self, i):
+        return self.dep_labels[self.deps[i]]
+
+    def __getstate__(self):
+        return tuple(getattr(self, k) for k in self.__slots__)
+
+    def __setstate__(self, state):
+        for k, v in zip(self.__slots__, state):
+            setattr(self, k, v)
+
+    def __repr__(self):
+        return '{}(nr_tokens={}, nr_entities={}, nr_relations={})'.format(
+            type(self).__name__, len(self), len(self.entity_tokens), len(self.relation_tokens)
+        )
@@ -21,3 +21,18 @@ class ParserBackend(object):
     def parse(self, sentence):
         raise NotImplementedError()
 
+    def get_resource_stats(self):
+        """
+        Get the sizes of the resources that may grow while parsing (e.g., vocabularies),
+        as a dict from names to numbers. Used by the recycling mode of the parser.
+        """
+        return dict()
+
+    def parse_iter(self, sentences, **kwargs):
+        """
+        Parse a stream of sentences, yielding one graph per sentence in order.
+        Subclasses may override this method to batch the underlying computation.
+        """
+        for sentence in sentences:
+            yield self.parse(sentence, **kwargs)
+
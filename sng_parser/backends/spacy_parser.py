@@ -11,6 +11,7 @@
 
 from copy import deepcopy
 from .. import database
+from ..alignment import TokenAlignment
 from ..parser import Parser
 from .backend import ParserBackend
 
@@ -52,7 +53,14 @@ class SpacyParser(ParserBackend):
         except OSError as e:
             raise ImportError('Unable to load the English model. Run `python -m spacy download en` first.') from e
 
-    def parse(self, sentence, doc=None, return_doc=False):
+    def get_resource_stats(self):
+        """
+        The spaCy `Vocab` and `StringStore` keep every string seen so far, so they grow without bound
+        on a stream of unique sentences.
+        """
+        return {'vocab_size': len(self.nlp.vocab), 'string_store_size': len(self.nlp.vocab.strings)}
+
+    def parse(self, sentence, doc=None, return_doc=False, return_alignment=False, return_dependencies=False):
         """
         The spaCy-based parser parse the sentence into scene graphs based on the dependency parsing
         of the sentence by spaCy.
@@ -66,8 +74,30 @@ class SpacyParser(ParserBackend):
             2. determine the subject of verbs (including nsubj, acl and pobjpass). Please refer to the comments
             in the code for better explanation.
             3. determine all the relations among entities.
+
+        Args:
+            sentence (str): the input sentence.
+            doc (spacy.tokens.Doc): an already processed document. If given, `sentence` is ignored.
+            return_doc (bool): also return the spaCy `Doc`.
+            return_alignment (bool): also return a :class:`TokenAlignment`, a compact and picklable
+                record of the token offsets, tags and heads, and the tokens behind each entity and relation.
+                Prefer this over `return_doc` when the results are kept or sent to other processes.
+            return_dependencies (bool): also return the lexicon entries looked up during the extraction,
+                as a :class:`database.LexiconDependencies` stamped with the lexicon versions. See `refresh`.
+
+        Returns:
+            graph, or a tuple of (graph, doc, alignment, dependencies) containing the requested extra outputs.
         """
-        doc = doc or self.nlp(sentence)
+        if doc is None:
+            doc = self.nlp(sentence)
+
+        if return_dependencies:
+            with database.record_dependencies() as dependencies:
+                outputs = self.parse(None, doc=doc, return_doc=return_doc, return_alignment=return_alignment)
+            if not isinstance(outputs, tuple):
+                outputs = (outputs, )
+            dependencies.entries = frozenset(dependencies.entries)
+            return outputs + (dependencies, )
 
         # Step 1: determine the entities.
         entities = list()
@@ -132,6 +162,7 @@ class SpacyParser(ParserBackend):
 
         # Step 3: determine the relations.
         relations = list()
+        relation_tokens = list()
         fake_noun_marks = set()
         for entity in doc.noun_chunks:
             # Again, the subjects and the objects are represented by their position.
@@ -247,13 +278,16 @@ class SpacyParser(ParserBackend):
 
             if relation is not None:
                 relations.append(relation)
+                # In all the cases above, the (last word of the) relation directly governs the object.
+                relation_tokens.append(entity.root.head.i)
 
         # Apply the `fake_noun_marks`.
         entities = [e for e, ec in zip(entities, entity_chunks) if ec.root.i not in fake_noun_marks]
         entity_chunks = [ec for ec in entity_chunks if ec.root.i not in fake_noun_marks]
 
         filtered_relations = list()
-        for relation in relations:
+        filtered_relation_tokens = list()
+        for relation, relation_token in zip(relations, relation_tokens):
             # Use a helper function to map the subj/obj represented by the position
             # back to one of the entity nodes.
             for x in self.__flatten_conjunction(doc[relation['subject']]):
@@ -263,10 +297,88 @@ class SpacyParser(ParserBackend):
                     rel['object'] = self.__locate_noun(entity_chunks, y.i)
                     if rel['subject'] != None and rel['object'] != None:
                         filtered_relations.append(rel)
+                        filtered_relation_tokens.append(relation_token)
 
+        graph = {'entities': entities, 'relations': filtered_relations}
+        if not return_doc and not return_alignment:
+            return graph
+
+        outputs = [graph]
         if return_doc:
-            return {'entities': entities, 'relations': filtered_relations}, doc
-        return {'entities': entities, 'relations': filtered_relations}
+            outputs.append(doc)
+        if return_alignment:
+            outputs.append(self.__make_alignment(doc, entity_chunks, filtered_relations, filtered_relation_tokens))
+        return tuple(outputs)
+
+    def parse_iter(self, sentences, batch_size=64, scheduler=None, return_doc=False, return_alignment=False, return_dependencies=False):
+        """
+        Parse a stream of sentences with `nlp.pipe`, yielding the graphs in the input order.
+        Only `batch_size` sentences are held in memory at a time. With a scheduler, up to one window
+        of sentences (see :class:`BatchScheduler`) is held, plus the docs finished ahead of the
+        earliest unfinished sentence.
+
+        Args:
+            sentences (Iterable[str]): the input sentences.
+            batch_size (int): the number of sentences sent to spaCy at a time.
+            scheduler (BatchScheduler): if given, the batches are formed by the scheduler (grouped by length
+                and sized against an adaptive token budget) and `batch_size` is ignored.
+            return_doc (bool): also yield the spaCy `Doc`. See `parse` for details.
+            return_alignment (bool): also yield the :class:`TokenAlignment`. See `parse` for details.
+            return_dependencies (bool): also yield the lexicon dependencies. See `parse` for details.
+        """
+        if scheduler is not None:
+            docs = scheduler.pipe(self.nlp, sentences)
+        else:
+            docs = self.nlp.pipe(sentences, batch_size=batch_size)
+
+        for doc in docs:
+            yield self.parse(None, doc=doc, return_doc=return_doc, return_alignment=return_alignment, return_dependencies=return_dependencies)
+
+    def refresh(self, docs, graphs, dependencies, alignments=None):
+        """
+        Re-extract the graphs affected by lexicon changes from cached spaCy docs, without running
+        the spaCy pipeline again. Each graph is checked against all the lexicon changes made after the
+        versions stamped on its dependencies, so graphs parsed at different lexicon versions (e.g., across
+        several reloads) are all brought up to date. Only the affected graphs are re-extracted; `graphs`
+        and `dependencies` are updated in place. The entity and relation indices of a re-extracted graph
+        may change, so the alignments kept along with the graphs must be passed as `alignments` to be
+        updated as well; otherwise they go stale.
+
+        Example::
+        >>> graphs, docs, deps = map(list, zip(*parser.parse_iter(sentences, return_doc=True, return_dependencies=True)))
+        >>> # Edit the lexicon files...
+        >>> database.reload_lists()
+        >>> updated = parser.refresh(docs, graphs, deps)
+
+        Args:
+            docs (Sequence[spacy.tokens.Doc]): the cached docs (e.g., restored from a `DocBin`).
+            graphs (list[dict]): the graphs parsed from the docs.
+            dependencies (list[LexiconDependencies]): the dependencies returned along with the graphs.
+            alignments (list[TokenAlignment]): the alignments returned along with the graphs (optional).
+
+        Returns:
+            updated (list[int]): the indices of the re-extracted graphs.
+        """
+        updated = list()
+        for i, deps in enumerate(dependencies):
+            if database.is_affected(deps):
+                if alignments is not None:
+                    graphs[i], alignments[i], dependencies[i] = self.parse(None, doc=docs[i], return_alignment=True, return_dependencies=True)
+                else:
+                    graphs[i], dependencies[i] = self.parse(None, doc=docs[i], return_dependencies=True)
+                updated.append(i)
+        return updated
+
+    @staticmethod
+    def __make_alignment(doc, entity_chunks, relations, relation_tokens):
+        entity_tokens = [ec.root.i for ec in entity_chunks]
+        return TokenAlignment.from_tokens(
+            ((t.idx, t.idx + len(t.text), t.pos_, t.dep_, t.head.i) for t in doc),
+            entity_tokens,
+            relation_tokens,
+            [entity_tokens[rel['subject']] for rel in relations],
+            [entity_tokens[rel['object']] for rel in relations]
+        )
 
     @staticmethod
     def __locate_noun(chunks, i):
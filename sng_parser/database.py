@@ -9,33 +9,225 @@
 # Distributed under terms of the MIT license.
 # https://github.com/vacancy/SceneGraphParser
 
+import threading
+import contextlib
 import os.path as osp
 
 
 _caches = dict()
+_versions = dict()
+_changelog = dict()
+_paths = dict()
+_recorders = threading.local()
 
 
-def load_list(filename):
-    if filename not in _caches:
-        out = set()
-        for x in open(osp.join(osp.dirname(__file__), '_data', filename)):
+def _read_list(filename):
+    path = _paths.get(filename, osp.join(osp.dirname(__file__), '_data', filename))
+    out = set()
+    with open(path) as f:
+        for x in f:
             x = x.strip()
             if len(x) > 0:
                 out.add(x)
-        _caches[filename] = out
+    return out
+
+
+def load_list(filename):
+    if filename not in _caches:
+        _caches[filename] = _read_list(filename)
+        _versions.setdefault(filename, 0)
     return _caches[filename]
 
 
+def reload_list(filename, path=None):
+    """
+    Reload a lexicon from the disk, replacing the cached one.
+
+    Args:
+        filename (str): the name of the lexicon, e.g., 'phrasal-verbs.txt'.
+        path (str): if given, load the lexicon from this path from now on, instead of the packaged data.
+
+    Returns:
+        changes (set): the entries that have been added or removed.
+    """
+    # Load the old lexicon first (possibly from the old path), so that the changes are always recorded.
+    old = load_list(filename)
+    if path is not None:
+        _paths[filename] = path
+
+    new = _read_list(filename)
+    changes = old ^ new
+    if len(changes) > 0:
+        version = _versions[filename] + 1
+        _changelog.setdefault(filename, list()).append((version, frozenset(changes)))
+        # The lookups read the version before the lexicon, so the lexicon is replaced first: a lookup
+        # may be stamped with an old version (and recomputed later in vain), but never with a new one.
+        _caches[filename] = new
+        _versions[filename] = version
+    return changes
+
+
+def reload_lists(filenames=None):
+    """
+    Reload the lexicons (default: all loaded ones). See `reload_list`.
+
+    Returns:
+        changes (dict): a dict from the filenames to the added or removed entries.
+    """
+    if filenames is None:
+        filenames = list(_caches)
+    return {filename: reload_list(filename) for filename in filenames}
+
+
+def get_versions():
+    """
+    Get the versions of the loaded lexicons, as a dict from the filenames to ints.
+    A version is bumped every time a reload changes the lexicon.
+    """
+    return dict(_versions)
+
+
+def get_paths():
+    """
+    Get the paths set by `reload_list`, as a dict from the filenames to the paths.
+    """
+    return dict(_paths)
+
+
+def sync_lists(versions, paths):
+    """
+    Bring the lexicons up to the versions and the paths of another process (e.g., the parent of a worker
+    process, see `get_versions` and `get_paths`). The lexicons behind, or loaded from another path, are
+    reloaded from the disk and take the given versions, so that the versions stamped on the dependencies
+    recorded here are consistent with the other process.
+
+    Args:
+        versions (dict): a dict from the filenames to versions.
+        paths (dict): a dict from the filenames to paths.
+    """
+    for filename in set(versions) | set(paths) | set(_paths):
+        version = versions.get(filename, 0)
+        if _versions.get(filename, 0) >= version and _paths.get(filename) == paths.get(filename):
+            continue
+        if filename in paths:
+            _paths[filename] = paths[filename]
+        else:
+            _paths.pop(filename, None)
+
+        if filename in _caches or filename in versions:
+            new = _read_list(filename)
+            old = _caches.get(filename)
+            if old is not None and version > _versions.get(filename, 0):
+                _changelog.setdefault(filename, list()).append((version, frozenset(old ^ new)))
+            _caches[filename] = new
+            _versions[filename] = max(version, _versions.get(filename, 0))
+
+
+def changes_since(versions):
+    """
+    Get the lexicon entries changed after the given versions (e.g., the versions stamped on
+    a :class:`LexiconDependencies`), over all the reloads since then.
+
+    Args:
+        versions (dict): a dict from the filenames to versions.
+
+    Returns:
+        changes (dict): a dict from the filenames to the added or removed entries.
+    """
+    changes = dict()
+    for filename, version in versions.items():
+        entries = set()
+        for v, changed in _changelog.get(filename, ()):
+            if v > version:
+                entries.update(changed)
+        changes[filename] = entries
+    return changes
+
+
+class LexiconDependencies(object):
+    """
+    The lexicon lookups (both hits and misses) made when computing a result.
+
+    Attributes:
+        entries (set): the (filename, entry) pairs looked up.
+        versions (dict): the version of each lexicon looked up, at the time of the lookups.
+    """
+
+    __slots__ = ['entries', 'versions']
+
+    def __init__(self, entries=None, versions=None):
+        self.entries = entries if entries is not None else set()
+        self.versions = versions if versions is not None else dict()
+
+    def __getstate__(self):
+        return self.entries, self.versions
+
+    def __setstate__(self, state):
+        self.entries, self.versions = state
+
+    def __repr__(self):
+        return '{}(entries={}, versions={})'.format(type(self).__name__, self.entries, self.versions)
+
+
+@contextlib.contextmanager
+def record_dependencies():
+    """
+    Record all the lexicon lookups (both hits and misses) in this thread within the context,
+    as a :class:`LexiconDependencies` stamped with the versions of the lexicons looked up.
+
+    Example::
+    >>> with record_dependencies() as deps:
+    >>>     is_phrasal_verb('look at')
+    >>> deps
+    LexiconDependencies(entries={('phrasal-verbs.txt', 'look at')}, versions={'phrasal-verbs.txt': 0})
+    """
+    stack = getattr(_recorders, 'stack', None)
+    if stack is None:
+        stack = _recorders.stack = list()
+    deps = LexiconDependencies()
+    stack.append(deps)
+    try:
+        yield deps
+    finally:
+        stack.pop()
+
+
+def is_affected(dependencies, changes=None):
+    """
+    Check whether a result depending on the lexicon lookups `dependencies` (see `record_dependencies`)
+    may have changed. By default, all the lexicon changes after the versions stamped on the dependencies
+    are considered (see `changes_since`); alternatively, specific `changes` can be given.
+    """
+    if changes is None:
+        changes = changes_since(dependencies.versions)
+    for filename, entry in dependencies.entries:
+        if entry in changes.get(filename, ()):
+            return True
+    return False
+
+
+def _record(filename, *entries):
+    # Called before the lexicon is read, see `reload_list`.
+    stack = getattr(_recorders, 'stack', None)
+    if stack:
+        version = _versions.get(filename, 0)
+        for deps in stack:
+            deps.versions.setdefault(filename, version)
+            deps.entries.update((filename, entry) for entry in entries)
+
+
 def is_phrasal_verb(verb):
+    _record('phrasal-verbs.txt', verb)
     return verb in load_list('phrasal-verbs.txt')
 
 
 def is_phrasal_prep(prep):
+    _record('phrasal-preps.txt', prep)
     return prep in load_list('phrasal-preps.txt')
 
 
 def is_scene_noun(noun):
     head = noun.split(' ')[-1]
-    s = load_list('scene-nouns.txt') 
+    _record('scene-nouns.txt', noun, head)
+    s = load_list('scene-nouns.txt')
     return noun in s or head in s
-
@@ -0,0 +1,325 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File   : export.py
+# Author : Jiayuan Mao
+# Email  : maojiayuan@gmail.com
+# Date   : 10/19/2026
+#
+# This file is part of SceneGraphParser.
+# Distributed under terms of the MIT license.
+# https://github.com/vacancy/SceneGraphParser
+
+"""
+Streaming exporters for parsed scene graphs.
+
+All writers consume graphs one at a time, so they can be chained directly
+after :meth:`Parser.parse_iter` without holding the whole corpus in memory::
+
+    >>> parser = sng_parser.Parser()
+    >>> with open('captions.txt') as f:
+    >>>     sentences = (line.strip() for line in f)
+    >>>     sng_parser.export_triples(parser.parse_iter(sentences), 'triples.tsv.gz')
+"""
+
+import io
+import csv
+import json
+import itertools
+import os.path as osp
+
+__all__ = [
+    'GraphWriter', 'JSONLWriter', 'TripleWriter', 'CSVWriter',
+    'export_jsonl', 'export_triples', 'export_csv'
+]
+
+_default_buffer_size = 1 << 20
+
+
+def _load_zstd():
+    try:
+        from compression import zstd  # Python 3.14+.
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError('zstd compression requires Python 3.14+ or the zstandard library. Install zstandard via pip first.') from e
+    return zstandard
+
+
+def _infer_compression(filename):
+    ext = osp.splitext(filename)[1].lower()
+    return {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}.get(ext, None)
+
+
+def open_output(file, compression='infer', buffer_size=_default_buffer_size):
+    """
+    Open a text stream for writing with a large write buffer.
+
+    Args:
+        file (str or file-like): the output filename. A file-like object is returned as it is.
+        compression (str): one of None, 'gzip', 'bz2', 'xz', 'zstd' and 'infer' (from the file extension).
+        buffer_size (int): the size of the write buffer in bytes.
+
+    Returns:
+        (stream, owned): the text stream and whether the caller is responsible for closing it.
+    """
+    if hasattr(file, 'write'):
+        return file, False
+
+    if compression == 'infer':
+        compression = _infer_compression(file)
+
+    if compression is None:
+        raw = open(file, 'wb', buffering=buffer_size)
+    elif compression == 'gzip':
+        import gzip
+        raw = io.BufferedWriter(gzip.open(file, 'wb', compresslevel=6), buffer_size=buffer_size)
+    elif compression == 'bz2':
+        import bz2
+        raw = io.BufferedWriter(bz2.open(file, 'wb'), buffer_size=buffer_size)
+    elif compression == 'xz':
+        import lzma
+        raw = io.BufferedWriter(lzma.open(file, 'wb'), buffer_size=buffer_size)
+    elif compression == 'zstd':
+        raw = io.BufferedWriter(_load_zstd().open(file, 'wb'), buffer_size=buffer_size)
+    else:
+        raise ValueError('Unknown compression: {}.'.format(compression))
+
+    return io.TextIOWrapper(raw, encoding='utf-8', newline=''), True
+
+
+def _get_json_dumps():
+    try:
+        import orjson
+    except ImportError:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), check_circular=False)
+        return encoder.encode
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+    return dumps
+
+
+def _clean(field):
+    # TSV fields cannot contain the separators.
+    return field.replace('\t', ' ').replace('\n', ' ').replace('\r', ' ')
+
+
+class GraphWriter(object):
+    """
+    Base class for all streaming graph writers. Use the writer as a context manager,
+    or call `close` explicitly when finished.
+
+    Each graph can be associated with a key (e.g., the sentence or an image id). If no
+    key is given, the zero-based index of the graph in the stream is used.
+    """
+
+    def __init__(self, file, compression='infer', buffer_size=_default_buffer_size):
+        self._file, self._owned = open_output(file, compression, buffer_size)
+        self._nr_graphs = 0
+
+    @property
+    def nr_graphs(self):
+        """
+        Get the number of graphs written so far.
+        """
+        return self._nr_graphs
+
+    def write(self, graph, key=None):
+        if key is None:
+            key = self._nr_graphs
+        self._write(graph, key)
+        self._nr_graphs += 1
+
+    def write_all(self, graphs, keys=None):
+        """
+        Write all graphs from an iterable. If `keys` is given, it is consumed in lockstep with `graphs`,
+        and a ValueError is raised if the two have different lengths.
+
+        Returns:
+            int: the number of graphs written.
+        """
+        start = self._nr_graphs
+        if keys is None:
+            for graph in graphs:
+                self.write(graph)
+        else:
+            sentinel = object()
+            for key, graph in itertools.zip_longest(keys, graphs, fillvalue=sentinel):
+                if key is sentinel or graph is sentinel:
+                    raise ValueError('The numbers of keys and graphs do not match: {} graphs have been written.'.format(self._nr_graphs - start))
+                self.write(graph, key)
+        return self._nr_graphs - start
+
+    def _write(self, graph, key):
+        raise NotImplementedError()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class JSONLWriter(GraphWriter):
+    """
+    Write one JSON object per line. If orjson is installed, it is used as the encoder.
+    """
+
+    def __init__(self, file, with_key=False, **kwargs):
+        """
+        Args:
+            file (str or file-like): the output file.
+            with_key (bool): if True, each line is {"key": key, "entities": ..., "relations": ...}.
+        """
+        super().__init__(file, **kwargs)
+        self.with_key = with_key
+        self._dumps = _get_json_dumps()
+
+    def _write(self, graph, key):
+        if self.with_key:
+            graph = {'key': key, **graph}
+        self._file.write(self._dumps(graph))
+        self._file.write('\n')
+
+
+class TripleWriter(GraphWriter):
+    """
+    Write (key, subject, predicate, object) rows as TSV, one row per relation.
+    """
+
+    def __init__(self, file, lemma=False, lower=False, header=False, **kwargs):
+        """
+        Args:
+            file (str or file-like): the output file.
+            lemma (bool): use the lemmatized heads and relations.
+            lower (bool): lowercase the subject, predicate and object fields (the key is kept as it is).
+            header (bool): write a header row first.
+        """
+        super().__init__(file, **kwargs)
+        self._head_key = 'lemma_head' if lemma else 'head'
+        self._relation_key = 'lemma_relation' if lemma else 'relation'
+        self.lower = lower
+
+        if header:
+            self._file.write('key\tsubject\tpredicate\tobject\n')
+
+    def _write(self, graph, key):
+        entities = graph['entities']
+        key = _clean(str(key))
+        head_key, relation_key = self._head_key, self._relation_key
+
+        rows = list()
+        for rel in graph['relations']:
+            row = '\t'.join((
+                _clean(entities[rel['subject']][head_key]),
+                _clean(rel[relation_key]),
+                _clean(entities[rel['object']][head_key])
+            ))
+            if self.lower:
+                row = row.lower()
+            rows.append(key + '\t' + row + '\n')
+
+        self._file.write(''.join(rows))
+
+
+class CSVWriter(GraphWriter):
+    """
+    Write the entities and the relations of the graphs into two CSV files.
+
+    The entity file has columns: key, entity, head, span, type, modifiers.
+    The relation file has columns: key, subject, object, relation, subject_head, object_head,
+    where `subject` and `object` are the entity indices within the graph.
+    """
+
+    def __init__(self, entity_file, relation_file, lemma=False, header=True, **kwargs):
+        """
+        Args:
+            entity_file (str or file-like): the output file for entities.
+            relation_file (str or file-like): the output file for relations.
+            lemma (bool): use the lemmatized spans, heads and relations.
+            header (bool): write a header row first.
+        """
+        super().__init__(entity_file, **kwargs)
+        try:
+            self._relation_file, self._relation_owned = open_output(relation_file, kwargs.get('compression', 'infer'), kwargs.get('buffer_size', _default_buffer_size))
+        except BaseException:
+            if self._owned:
+                self._file.close()
+            raise
+        self._entity_csv = csv.writer(self._file)
+        self._relation_csv = csv.writer(self._relation_file)
+
+        self._prefix = 'lemma_' if lemma else ''
+
+        if header:
+            self._entity_csv.writerow(('key', 'entity', 'head', 'span', 'type', 'modifiers'))
+            self._relation_csv.writerow(('key', 'subject', 'object', 'relation', 'subject_head', 'object_head'))
+
+    def _write(self, graph, key):
+        p = self._prefix
+        entities = graph['entities']
+
+        self._entity_csv.writerows(
+            (key, i, e[p + 'head'], e[p + 'span'], e.get('type', ''), ','.join(m[p + 'span'] for m in e['modifiers']))
+            for i, e in enumerate(entities)
+        )
+        self._relation_csv.writerows(
+            (key, rel['subject'], rel['object'], rel[p + 'relation'], entities[rel['subject']][p + 'head'], entities[rel['object']][p + 'head'])
+            for rel in graph['relations']
+        )
+
+    def flush(self):
+        super().flush()
+        self._relation_file.flush()
+
+    def close(self):
+        super().close()
+        if self._relation_owned:
+            self._relation_file.close()
+        else:
+            self._relation_file.flush()
+
+
+def export_jsonl(graphs, file, keys=None, **kwargs):
+    """
+    Export a stream of graphs as JSON lines. See :class:`JSONLWriter` for the options.
+
+    Returns:
+        int: the number of graphs written.
+    """
+    with JSONLWriter(file, **kwargs) as writer:
+        return writer.write_all(graphs, keys)
+
+
+def export_triples(graphs, file, keys=None, **kwargs):
+    """
+    Export a stream of graphs as (key, subject, predicate, object) TSV rows. See :class:`TripleWriter` for the options.
+
+    Returns:
+        int: the number of graphs written.
+    """
+    with TripleWriter(file, **kwargs) as writer:
+        return writer.write_all(graphs, keys)
+
+
+def export_csv(graphs, entity_file, relation_file, keys=None, **kwargs):
+    """
+    Export a stream of graphs as entity and relation CSV files. See :class:`CSVWriter` for the options.
+
+    Returns:
+        int: the number of graphs written.
+    """
+    with CSVWriter(entity_file, relation_file, **kwargs) as writer:
+        return writer.write_all(graphs, keys)
@@ -9,6 +9,12 @@
 # Distributed under terms of the MIT license.
 # https://github.com/vacancy/SceneGraphParser
 
+import gc
+import os
+import time
+import itertools
+import threading
+
 __all__ = ['Parser', 'get_default_parser', 'parse']
 
 
@@ -16,6 +22,22 @@ def _load_backends():
     from . import backends
 
 
+def _get_rss():
+    """
+    Get the resident set size of the current process in bytes, or None if unavailable.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
 class Parser(object):
     """
     The scene graph parser. To instantiate a scene graph parser,
@@ -46,6 +68,16 @@ class Parser(object):
         self._init_kwargs = kwargs
         self._inst = type(self)._backend_registry[self.backend](**kwargs)
 
+        self._recycle_config = None
+        self._recycle_lock = threading.Lock()
+        # Guards the sentence counter and the check scheduling, which are updated by concurrent parse calls.
+        self._counter_lock = threading.Lock()
+        self._recycle_stats = {'nr_recycles': 0, 'last': None}
+        self._nr_parsed = 0
+        self._next_check = None
+        self._last_recycle = 0
+        self._rss_threshold = None
+
     @property
     def init_kwargs(self):
         """
@@ -71,7 +103,195 @@ class Parser(object):
             graph (dict): the parsed scene graph. Please refer to the
             README file for the specification of the return value.
         """
-        return self.unwrapped.parse(sentence, **kwargs)
+        graph = self.unwrapped.parse(sentence, **kwargs)
+        if self._recycle_config is not None:
+            self._after_parse(1)
+        return graph
+
+    def parse_iter(self, sentences, **kwargs):
+        """
+        Lazily parse a stream of sentences into scene graphs. The graphs are
+        yielded in the same order as the input sentences, so the input can be
+        an arbitrarily long iterator (e.g., lines of a file).
+
+        Args:
+            sentences (Iterable[str]): the input sentences.
+
+        Returns:
+            graphs (Iterator[dict]): the parsed scene graphs.
+        """
+        if self._recycle_config is None:
+            return self.unwrapped.parse_iter(sentences, **kwargs)
+        return self._parse_iter_recycling(sentences, kwargs)
+
+    def _parse_iter_recycling(self, sentences, kwargs):
+        # Process the stream in chunks so that a recycled backend is picked up by the next chunk.
+        # With a batch scheduler, the chunks are its windows, so that the scheduling is not affected.
+        scheduler = kwargs.get('scheduler', None)
+        if scheduler is not None:
+            chunks = scheduler.iter_windows(sentences)
+        else:
+            chunks = self._iter_chunks(sentences, self._recycle_config['check_interval'])
+
+        for chunk in chunks:
+            yield from self.unwrapped.parse_iter(chunk, **kwargs)
+            self._after_parse(len(chunk))
+
+    @staticmethod
+    def _iter_chunks(sentences, chunk_size):
+        it = iter(sentences)
+        while True:
+            chunk = list(itertools.islice(it, chunk_size))
+            if len(chunk) == 0:
+                break
+            yield chunk
+
+    def parse_batch(self, sentences, **kwargs):
+        """
+        Parse a list of sentences into a list of scene graphs.
+
+        Args:
+            sentences (Iterable[str]): the input sentences.
+
+        Returns:
+            graphs (list[dict]): the parsed scene graphs.
+        """
+        return list(self.parse_iter(sentences, **kwargs))
+
+    def refresh(self, docs, graphs, dependencies, **kwargs):
+        """
+        Re-extract, from cached parses, the graphs affected by the lexicon changes made since they
+        were parsed. The graphs (and the dependencies) are updated in place. Please refer to the
+        implementation of your parser backend (e.g., `SpacyParser.refresh`) for details.
+
+        Args:
+            docs (Sequence): the cached parses of the sentences by the backend.
+            graphs (list[dict]): the graphs parsed from the sentences.
+            dependencies (list[LexiconDependencies]): the lexicon dependencies returned along with the graphs.
+
+        Returns:
+            updated (list[int]): the indices of the re-extracted graphs.
+        """
+        return self.unwrapped.refresh(docs, graphs, dependencies, **kwargs)
+
+    def enable_recycling(self, max_resource_size=None, max_rss=None, rss_margin=None, min_recycle_interval=0, check_interval=1000, callback=None):
+        """
+        Enable the long-running mode. In this mode, the parser periodically checks the resource usage
+        of the backend (e.g., the size of the spaCy vocabulary, see `ParserBackend.get_resource_stats`)
+        and the resident memory of the process. Once any threshold is exceeded, a new backend is created
+        with the same initialization arguments and swapped in. Requests already running on the old backend
+        finish on it; the old backend is released afterwards.
+
+        Args:
+            max_resource_size (int or dict): the threshold on the backend resources. An int applies to all
+                the resources reported by the backend; a dict specifies the threshold per resource name.
+            max_rss (int): the threshold on the resident memory of the process, in bytes. The memory freed by
+                a recycle is often not returned to the OS, so the resident memory may stay above `max_rss`
+                afterwards. Thus, after each recycle, the threshold is raised to the resident memory measured
+                right after the recycle plus `rss_margin` (if that is above `max_rss`).
+            rss_margin (int): the growth of the resident memory, in bytes, since the last recycle that triggers
+                another recycle (default: 10% of `max_rss`).
+            min_recycle_interval (int): the minimum number of sentences between two automatic recycles.
+            check_interval (int): check the usage after every this many sentences. In `parse_iter` with a
+                batch scheduler, the usage is checked (and the backend swapped) between the scheduler windows instead.
+            callback (Callable[[dict], None]): called with the metrics of each recycle.
+        """
+        if rss_margin is None and max_rss is not None:
+            rss_margin = max_rss // 10
+
+        self._recycle_config = {
+            'max_resource_size': max_resource_size,
+            'max_rss': max_rss,
+            'rss_margin': rss_margin,
+            'min_recycle_interval': min_recycle_interval,
+            'check_interval': check_interval,
+            'callback': callback
+        }
+        self._rss_threshold = max_rss
+        with self._counter_lock:
+            self._next_check = self._nr_parsed + check_interval
+
+    def disable_recycling(self):
+        """
+        Disable the long-running mode.
+        """
+        self._recycle_config = None
+
+    @property
+    def recycle_stats(self):
+        """
+        Get the number of recycles so far and the metrics of the last one.
+        """
+        return dict(self._recycle_stats)
+
+    def recycle(self, reason='manual'):
+        """
+        Create a new backend and swap it in. See `enable_recycling`.
+
+        Returns:
+            metrics (dict): the metrics of this recycle, or None if another thread is already recycling.
+        """
+        if not self._recycle_lock.acquire(blocking=False):
+            return None
+
+        try:
+            old = self._inst
+            metrics = {
+                'reason': reason,
+                'nr_parsed': self._nr_parsed,
+                'resources_before': old.get_resource_stats(),
+                'rss_before': _get_rss()
+            }
+
+            tic = time.perf_counter()
+            self._inst = type(self)._backend_registry[self.backend](**self._init_kwargs)
+            metrics['reload_time'] = time.perf_counter() - tic
+
+            del old
+            gc.collect()
+            metrics['rss_after'] = _get_rss()
+
+            config = self._recycle_config
+            if config is not None and config['max_rss'] is not None and metrics['rss_after'] is not None:
+                self._rss_threshold = max(config['max_rss'], metrics['rss_after'] + config['rss_margin'])
+                metrics['rss_threshold'] = self._rss_threshold
+            with self._counter_lock:
+                self._last_recycle = self._nr_parsed
+
+            self._recycle_stats = {'nr_recycles': self._recycle_stats['nr_recycles'] + 1, 'last': metrics}
+        finally:
+            self._recycle_lock.release()
+
+        config = self._recycle_config
+        if config is not None and config['callback'] is not None:
+            config['callback'](metrics)
+        return metrics
+
+    def _after_parse(self, nr_sentences):
+        config = self._recycle_config
+        with self._counter_lock:
+            self._nr_parsed += nr_sentences
+            if config is None or self._nr_parsed < self._next_check:
+                return
+            self._next_check = self._nr_parsed + config['check_interval']
+            if self._nr_parsed - self._last_recycle < config['min_recycle_interval']:
+                return
+
+        reason = None
+        max_resource_size = config['max_resource_size']
+        if max_resource_size is not None:
+            for name, size in self.unwrapped.get_resource_stats().items():
+                threshold = max_resource_size.get(name) if isinstance(max_resource_size, dict) else max_resource_size
+                if threshold is not None and size > threshold:
+                    reason = name
+                    break
+        if reason is None and self._rss_threshold is not None:
+            rss = _get_rss()
+            if rss is not None and rss > self._rss_threshold:
+                reason = 'rss'
+
+        if reason is not None:
+            self.recycle(reason)
 
     _default_backend = 'spacy'
     _backend_registry = dict()
@@ -0,0 +1,229 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File   : pool.py
+# Author : Jiayuan Mao
+# Email  : maojiayuan@gmail.com
+# Date   : 10/19/2026
+#
+# This file is part of SceneGraphParser.
+# Distributed under terms of the MIT license.
+# https://github.com/vacancy/SceneGraphParser
+
+import gc
+import os
+import queue
+import pickle
+import marshal
+import itertools
+import collections
+import multiprocessing
+import multiprocessing.context
+
+from . import database
+from .parser import Parser
+
+__all__ = ['ParserPool']
+
+
+# The parsers are registered here before forking, so that the workers inherit them (copy-on-write)
+# instead of loading the models again.
+_pool_parsers = dict()
+_pool_counter = itertools.count()
+
+_MARSHAL, _PICKLE = b'm', b'p'
+
+
+def _encode(results):
+    # Graphs only contain dicts, lists, tuples, strings and ints, for which marshal is both
+    # more compact and much faster than pickle. Other outputs (e.g., alignments) fall back to pickle.
+    try:
+        return _MARSHAL + marshal.dumps(results)
+    except ValueError:
+        return _PICKLE + pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(data):
+    if data[:1] == _MARSHAL:
+        return marshal.loads(data[1:])
+    return pickle.loads(data[1:])
+
+
+if hasattr(multiprocessing.context, 'ForkContext'):
+    class _FreezingForkProcess(multiprocessing.context.ForkProcess):
+        # Move all objects (including the model) out of the tracked generations right before forking,
+        # so that the garbage collector in the worker does not touch (and thus copy) the shared pages.
+        # The parent is unfrozen right after, so its own garbage collection is unaffected.
+        def start(self):
+            gc.freeze()
+            try:
+                super().start()
+            finally:
+                gc.unfreeze()
+
+    class _FreezingForkContext(multiprocessing.context.ForkContext):
+        Process = _FreezingForkProcess
+else:
+    _FreezingForkContext = None
+
+
+def _worker_parse(args):
+    token, start, sentences, kwargs, versions, paths = args
+    # Catch up with the lexicon reloads made in the parent after this worker was forked.
+    if versions != database.get_versions() or paths != database.get_paths():
+        database.sync_lists(versions, paths)
+    parser = _pool_parsers[token]
+    return start, _encode(list(parser.parse_iter(sentences, **kwargs)))
+
+
+class ParserPool(object):
+    """
+    A pool of worker processes sharing a single parser.
+
+    The parser (and thus the backend model) is loaded once in the parent process, and the
+    workers are forked from it, so the model memory is shared copy-on-write. Sentences are
+    sent to the workers in chunks, and each chunk of results is returned as a single compact
+    byte string. This requires the `fork` start method, i.e., a POSIX system.
+
+    The lexicon reloads in the parent (see `database.reload_list`) are propagated to the workers:
+    the lexicon versions are sent along with each chunk, and a worker behind reloads the lexicons
+    from the disk before parsing the chunk.
+
+    Example::
+    >>> with ParserPool(nr_workers=8) as pool:
+    >>>     for graph in pool.imap(sentences):
+    >>>         pass
+    """
+
+    def __init__(self, parser=None, nr_workers=None, chunk_size=64, max_sentences_per_worker=None, max_pending_chunks=None, **kwargs):
+        """
+        Args:
+            parser (Parser): the parser to share. If None, a new parser is created with `kwargs`
+                (e.g., `backend` and the backend initialization arguments).
+            nr_workers (int): the number of worker processes (default: the number of CPUs).
+            chunk_size (int): the number of sentences sent to a worker at a time.
+            max_sentences_per_worker (int): if given, a worker is replaced by a freshly forked one after
+                parsing (approximately) this many sentences. Useful for bounding the memory of the workers.
+            max_pending_chunks (int): the maximum number of chunks submitted but not yet consumed
+                (default: 2 * nr_workers). This bounds the memory used by the input and the results.
+        """
+        if parser is None:
+            parser = Parser(**kwargs)
+        elif len(kwargs) > 0:
+            raise ValueError('Parser initialization arguments are not allowed when the parser is given.')
+
+        self.parser = parser
+        self.nr_workers = nr_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_sentences_per_worker = max_sentences_per_worker
+        self.max_pending_chunks = max_pending_chunks or 2 * self.nr_workers
+
+        max_tasks_per_child = None
+        if max_sentences_per_worker is not None:
+            max_tasks_per_child = max(1, max_sentences_per_worker // chunk_size)
+
+        if _FreezingForkContext is None:
+            raise RuntimeError('ParserPool requires the fork start method, which is unavailable on this platform.')
+
+        self._token = next(_pool_counter)
+        _pool_parsers[self._token] = self.parser
+
+        # The workers replacing the recycled ones (`maxtasksperchild`) are also started by this context,
+        # so they are forked from a frozen heap as well.
+        self._pool = _FreezingForkContext().Pool(self.nr_workers, maxtasksperchild=max_tasks_per_child)
+        self._closed = False
+
+    def imap(self, sentences, ordered=True, **kwargs):
+        """
+        Lazily parse a stream of sentences. The extra keyword arguments are passed to the
+        `parse_iter` method of the parser.
+
+        Args:
+            sentences (Iterable[str]): the input sentences.
+            ordered (bool): if True, yield the graphs in the input order. Otherwise, yield (index, graph)
+                pairs as soon as the chunks are finished, where index is the position of the sentence in the input.
+
+        Returns:
+            Iterator: the graphs (ordered), or (index, graph) pairs (unordered).
+        """
+        if self._closed:
+            raise RuntimeError('The pool has been closed.')
+
+        tasks = self._iter_tasks(sentences, kwargs)
+        if ordered:
+            return self._imap_ordered(tasks)
+        return self._imap_unordered(tasks)
+
+    def map(self, sentences, **kwargs):
+        """
+        Parse a list of sentences into a list of scene graphs.
+        """
+        return list(self.imap(sentences, ordered=True, **kwargs))
+
+    def _iter_tasks(self, sentences, kwargs):
+        it = iter(sentences)
+        start = 0
+        while True:
+            chunk = list(itertools.islice(it, self.chunk_size))
+            if len(chunk) == 0:
+                break
+            yield self._token, start, chunk, kwargs, database.get_versions(), database.get_paths()
+            start += len(chunk)
+
+    def _imap_ordered(self, tasks):
+        pending = collections.deque()
+        for task in tasks:
+            pending.append(self._pool.apply_async(_worker_parse, (task, )))
+            if len(pending) >= self.max_pending_chunks:
+                yield from _decode(pending.popleft().get()[1])
+        while len(pending) > 0:
+            yield from _decode(pending.popleft().get()[1])
+
+    def _imap_unordered(self, tasks):
+        finished = queue.Queue()
+        nr_pending = 0
+
+        def get():
+            result = finished.get()
+            if isinstance(result, BaseException):
+                raise result
+            start, data = result
+            return enumerate(_decode(data), start)
+
+        for task in tasks:
+            self._pool.apply_async(_worker_parse, (task, ), callback=finished.put, error_callback=finished.put)
+            nr_pending += 1
+            if nr_pending >= self.max_pending_chunks:
+                yield from get()
+                nr_pending -= 1
+        while nr_pending > 0:
+            yield from get()
+            nr_pending -= 1
+
+    def close(self):
+        """
+        Wait for all submitted chunks to finish and shut down the workers.
+        """
+        if not self._closed:
+            self._closed = True
+            self._pool.close()
+            self._pool.join()
+            _pool_parsers.pop(self._token, None)
+
+    def terminate(self):
+        """
+        Shut down the workers immediately, discarding the unfinished chunks.
+        """
+        if not self._closed:
+            self._closed = True
+            self._pool.terminate()
+            self._pool.join()
+            _pool_parsers.pop(self._token, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
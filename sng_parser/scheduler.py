@@ -0,0 +1,247 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File   : scheduler.py
+# Author : Jiayuan Mao
+# Email  : maojiayuan@gmail.com
+# Date   : 10/19/2026
+#
+# This file is part of SceneGraphParser.
+# Distributed under terms of the MIT license.
+# https://github.com/vacancy/SceneGraphParser
+
+import time
+import bisect
+import collections
+
+__all__ = ['BatchScheduler']
+
+
+def _default_length(sentence):
+    # A cheap estimate of the number of tokens; punctuation is ignored.
+    return len(sentence.split())
+
+
+class BatchScheduler(object):
+    """
+    A length-bucketed batch scheduler for bulk parsing.
+
+    The input is consumed in windows of at most `window_size` sentences and `window_tokens` tokens.
+    Within a window, sentences are grouped into buckets by their (estimated) number of tokens, and
+    each bucket is cut, in the input order, into batches such that batch_size * max_length stays
+    within a token budget. The next batch is always taken from the bucket of the earliest unfinished
+    sentence, so the outputs are yielded in the input order as soon as a prefix is complete, and only
+    the outputs finished ahead of that prefix are held in memory. Since the throughput
+    strongly depends on the sentence length, each bucket has its own token budget, adapted online:
+    after each full batch, the measured throughput (tokens per second) is compared with the running
+    average of the bucket, and the budget keeps growing (or shrinking) as long as the throughput improves.
+    The last batch of a bucket in a window is cut by the window rather than by the budget, and is not
+    used for the adaptation. If a full window does not hold enough sentences of a bucket to reach
+    its budget, the budget is lowered to the size of the bucket within the window.
+
+    The scheduler is stateful: the adapted budgets and the statistics are kept across calls.
+
+    Example::
+    >>> scheduler = BatchScheduler(token_budget=2048)
+    >>> graphs = list(parser.parse_iter(sentences, scheduler=scheduler))
+    >>> pprint(scheduler.stats)
+    """
+
+    def __init__(
+        self, token_budget=2048, min_token_budget=256, max_token_budget=16384, max_batch_size=1024,
+        buckets=(8, 16, 32, 64, 128), window_size=4096, window_tokens=262144, adapt=True, step=1.25, momentum=0.9,
+        length_fn=None, history_size=256
+    ):
+        """
+        Args:
+            token_budget (int): the initial token budget per batch, for all buckets.
+            min_token_budget, max_token_budget (int): the range of the adapted token budget.
+            max_batch_size (int): the maximum number of sentences per batch.
+            buckets (Sequence[int]): the upper bounds (inclusive) of the bucket lengths. Longer sentences
+                go to an extra, unbounded bucket.
+            window_size (int): the maximum number of sentences read from the input at a time.
+            window_tokens (int): the maximum number of tokens read from the input at a time.
+            adapt (bool): whether to adapt the token budget online.
+            step (float): the multiplicative step of the budget adaptation.
+            momentum (float): the momentum of the running average of the throughput.
+            length_fn (Callable[[str], int]): estimates the number of tokens (default: whitespace split).
+            history_size (int): the number of recent batch decisions kept in the stats.
+        """
+        self.token_budget = token_budget
+        self.min_token_budget = min_token_budget
+        self.max_token_budget = max_token_budget
+        self.max_batch_size = max_batch_size
+        self.buckets = tuple(sorted(buckets))
+        self.window_size = window_size
+        self.window_tokens = window_tokens
+        self.adapt = adapt
+        self.step = step
+        self.momentum = momentum
+        self.length_fn = length_fn or _default_length
+
+        self._budgets = dict()
+        self._directions = dict()
+        self._avg_throughputs = dict()
+        self._history = collections.deque(maxlen=history_size)
+        self._bucket_sizes = collections.Counter()
+        self._batch_sizes = collections.Counter()
+        self._nr_sentences = 0
+        self._nr_tokens = 0
+        self._nr_batches = 0
+        self._elapsed = 0.0
+
+    @property
+    def stats(self):
+        """
+        Get the scheduling statistics, including the number of sentences per bucket (keyed by the
+        upper bound, None for the unbounded one), the histogram of the chosen batch sizes, the current token
+        budget and the running average of the throughput of each bucket, and the recent decisions as
+        (bucket, batch_size, nr_tokens, throughput).
+        """
+        return {
+            'nr_sentences': self._nr_sentences,
+            'nr_tokens': self._nr_tokens,
+            'nr_batches': self._nr_batches,
+            'elapsed': self._elapsed,
+            'token_budgets': dict(self._budgets),
+            'bucket_sizes': dict(self._bucket_sizes),
+            'batch_sizes': dict(self._batch_sizes),
+            'avg_throughputs': dict(self._avg_throughputs),
+            'overall_throughput': self._nr_tokens / self._elapsed if self._elapsed > 0 else None,
+            'history': list(self._history)
+        }
+
+    def reset_stats(self):
+        self._history.clear()
+        self._bucket_sizes.clear()
+        self._batch_sizes.clear()
+        self._nr_sentences = 0
+        self._nr_tokens = 0
+        self._nr_batches = 0
+        self._elapsed = 0.0
+
+    def run(self, process_fn, inputs):
+        """
+        Schedule the inputs into batches and process them.
+
+        Args:
+            process_fn (Callable[[list[str]], Iterable]): processes a batch of inputs, returning one output per input.
+            inputs (Iterable[str]): the inputs.
+
+        Returns:
+            Iterator: the outputs, in the input order.
+        """
+        for window, lengths, full_window in self._iter_windows(inputs):
+            yield from self._run_window(process_fn, window, lengths, full_window)
+
+    def iter_windows(self, inputs):
+        """
+        Split the inputs into the windows used by `run`. Running the scheduler on each window
+        separately schedules the batches exactly as running it on the whole inputs.
+
+        Returns:
+            Iterator[list]: the windows.
+        """
+        for window, _, _ in self._iter_windows(inputs):
+            yield window
+
+    def _iter_windows(self, inputs):
+        it = iter(inputs)
+        while True:
+            window, lengths, nr_tokens = list(), list(), 0
+            for x in it:
+                length = max(1, self.length_fn(x))
+                window.append(x)
+                lengths.append(length)
+                nr_tokens += length
+                if len(window) >= self.window_size or nr_tokens >= self.window_tokens:
+                    break
+            if len(window) == 0:
+                break
+            yield window, lengths, len(window) >= self.window_size or nr_tokens >= self.window_tokens
+
+    def pipe(self, nlp, texts, **kwargs):
+        """
+        A scheduled replacement of `nlp.pipe` for a spaCy pipeline.
+        """
+        return self.run(lambda batch: nlp.pipe(batch, batch_size=len(batch), **kwargs), texts)
+
+    def _run_window(self, process_fn, window, lengths, full_window=True):
+        bucket_of = list()
+        queues = collections.defaultdict(collections.deque)
+        for i, length in enumerate(lengths):
+            b = bisect.bisect_left(self.buckets, length)
+            bucket = self.buckets[b] if b < len(self.buckets) else None
+            bucket_of.append(bucket)
+            queues[bucket].append(i)
+        for bucket, indices in queues.items():
+            self._bucket_sizes[bucket] += len(indices)
+
+        started = set()
+        outputs = [None] * len(window)
+        finished = [False] * len(window)
+        next_output = 0
+        while next_output < len(window):
+            # The queues are in the input order, so the head of this queue is `next_output`.
+            bucket = bucket_of[next_output]
+            queue = queues[bucket]
+            budget = self._budgets.setdefault(bucket, self.token_budget)
+
+            batch = [queue.popleft()]
+            max_length = lengths[batch[0]]
+            while (
+                len(queue) > 0 and len(batch) < self.max_batch_size and
+                (len(batch) + 1) * max(max_length, lengths[queue[0]]) <= budget
+            ):
+                batch.append(queue.popleft())
+                max_length = max(max_length, lengths[batch[-1]])
+
+            nr_tokens = sum(lengths[i] for i in batch)
+            tic = time.perf_counter()
+            results = list(process_fn([window[i] for i in batch]))
+            elapsed = time.perf_counter() - tic
+
+            for i, r in zip(batch, results):
+                outputs[i] = r
+                finished[i] = True
+            # The last batch of a bucket is cut by the end of the window, not by the budget, and is not used for
+            # the adaptation, unless it is the whole bucket of a full window: then the budget cannot be reached
+            # within a window and is lowered to the size of the batch first.
+            whole = full_window and len(queue) == 0 and bucket not in started
+            if whole:
+                self._budgets[bucket] = max(self.min_token_budget, min(budget, len(batch) * max_length))
+            self._update(bucket, len(batch), nr_tokens, elapsed, adapt=len(queue) > 0 or whole)
+            started.add(bucket)
+
+            while next_output < len(window) and finished[next_output]:
+                yield outputs[next_output]
+                outputs[next_output] = None
+                next_output += 1
+
+    def _update(self, bucket, batch_size, nr_tokens, elapsed, adapt=True):
+        throughput = nr_tokens / elapsed if elapsed > 0 else float('inf')
+
+        self._nr_sentences += batch_size
+        self._nr_tokens += nr_tokens
+        self._nr_batches += 1
+        self._elapsed += elapsed
+        self._batch_sizes[batch_size] += 1
+        self._history.append((bucket, batch_size, nr_tokens, throughput))
+
+        if not adapt or throughput == float('inf'):
+            return
+
+        avg = self._avg_throughputs.get(bucket)
+        if avg is None:
+            self._avg_throughputs[bucket] = throughput
+            return
+
+        if self.adapt:
+            # Hill climbing: keep moving the budget in the same direction while it helps.
+            direction = self._directions.get(bucket, 1)
+            if throughput < avg:
+                direction = -direction
+            self._directions[bucket] = direction
+            budget = int(self._budgets[bucket] * self.step ** direction)
+            self._budgets[bucket] = min(self.max_token_budget, max(self.min_token_budget, budget))
+
+        self._avg_throughputs[bucket] = self.momentum * avg + (1 - self.momentum) * throughput
@@ -0,0 +1,83 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File   : soak-test.py
+# Author : Jiayuan Mao
+# Email  : maojiayuan@gmail.com
+# Date   : 10/19/2026
+#
+# This file is part of SceneGraphParser.
+# Distributed under terms of the MIT license.
+# https://github.com/vacancy/SceneGraphParser
+
+"""
+Soak test for the long-running mode of the parser. It parses a stream of unique
+sentences (made unique by random pseudo-words, which keep growing the spaCy vocabulary)
+and reports the memory usage periodically.
+
+Example::
+    python tools/soak-test.py --nr-sentences 2000000 --max-vocab-size 200000
+    python tools/soak-test.py --nr-sentences 2000000 --no-recycle  # baseline
+"""
+
+import random
+import string
+import argparse
+
+import sng_parser
+from sng_parser.parser import _get_rss
+
+_templates = [
+    'A {} is playing the {} in the room.',
+    'A {} standing next to a {}.',
+    'The {} is in front of a {}.',
+    'A {} is sitting on a {} near the {}.',
+]
+
+
+def random_word(rng):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+
+
+def generate_sentences(nr_sentences, seed):
+    rng = random.Random(seed)
+    for _ in range(nr_sentences):
+        template = rng.choice(_templates)
+        yield template.format(*[random_word(rng) for _ in range(template.count('{}'))])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=None, help='the spaCy model name or path (default: the default model)')
+    parser.add_argument('--nr-sentences', type=int, default=1000000)
+    parser.add_argument('--report-interval', type=int, default=50000)
+    parser.add_argument('--max-vocab-size', type=int, default=200000)
+    parser.add_argument('--max-rss-mb', type=int, default=None)
+    parser.add_argument('--check-interval', type=int, default=1000)
+    parser.add_argument('--no-recycle', action='store_true')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    def on_recycle(metrics):
+        print('Recycle:', metrics)
+
+    sg_parser = sng_parser.Parser(model=args.model)
+    if not args.no_recycle:
+        sg_parser.enable_recycling(
+            max_resource_size={'string_store_size': args.max_vocab_size},
+            max_rss=args.max_rss_mb * 1024 * 1024 if args.max_rss_mb is not None else None,
+            check_interval=args.check_interval,
+            callback=on_recycle
+        )
+
+    print('{:>12} {:>12} {:>12} {:>10}'.format('Sentences', 'RSS (MB)', 'Strings', 'Recycles'))
+    for i, _ in enumerate(sg_parser.parse_iter(generate_sentences(args.nr_sentences, args.seed)), 1):
+        if i % args.report_interval == 0:
+            print('{:>12} {:>12.1f} {:>12} {:>10}'.format(
+                i, (_get_rss() or 0) / 1024 / 1024,
+                sg_parser.unwrapped.get_resource_stats()['string_store_size'],
+                sg_parser.recycle_stats['nr_recycles']
+            ), flush=True)
+
+
+if __name__ == '__main__':
+    main()